@@ -0,0 +1,104 @@
+"""
+Benchmark the scraped-image pipeline against a local image server.
+
+Generates photo-sized images, serves them over HTTP and runs ImageService.prepare_images
+on markdown that references them (including repeated URLs, relative URLs and two URLs
+with the same content). Reports images per second and bytes saved, then runs the
+pipeline again to check that no asset is fetched twice.
+
+Run from the repository root:
+    python -m benchmarks.bench_images
+"""
+import io
+import os
+import time
+import random
+import tempfile
+import threading
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from PIL import Image
+from src.config import BaseConfig
+from src.service.image_service import ImageService
+
+IMAGE_COUNT = 24
+IMAGE_SIZE = (2400, 1600)
+
+
+def make_image(seed):
+    """Build a noisy gradient JPEG, which compresses about as badly as a photo."""
+    rng = random.Random(seed)
+    small = Image.new("RGB", (IMAGE_SIZE[0] // 8, IMAGE_SIZE[1] // 8))
+    small.putdata([
+        (x % 256, (y + seed * 40) % 256, rng.randrange(256))
+        for y in range(small.height) for x in range(small.width)
+    ])
+    output = io.BytesIO()
+    small.resize(IMAGE_SIZE, Image.BICUBIC).save(output, format="JPEG", quality=95)
+    return output.getvalue()
+
+
+def start_image_server(images):
+    hits = Counter()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits[self.path] += 1
+            body = images.get(self.path)
+            if body is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "image/jpeg")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, hits
+
+
+def main():
+    images = {f"/img/{i}.jpg": make_image(i) for i in range(IMAGE_COUNT)}
+    images["/img/copy-of-0.jpg"] = images["/img/0.jpg"]
+    server, hits = start_image_server(images)
+    page_url = f"http://127.0.0.1:{server.server_port}/article/"
+
+    lines = [f"![figure {i}](/img/{i}.jpg)" for i in range(IMAGE_COUNT)]
+    lines += ["![figure 0 again](/img/0.jpg)", "![copy](../img/copy-of-0.jpg)", '<img src="/img/1.jpg">', "![gone](/img/missing.png)"]
+    markdown = "\n\n".join(lines)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        BaseConfig.STATE_DB_PATH = os.path.join(tmp, "state.sqlite3")
+        BaseConfig.IMAGE_CACHE_DIR = os.path.join(tmp, "images")
+        BaseConfig.IMAGE_MAX_PER_DECK = 100
+        # The local image server is on a loopback address and a non-default port
+        BaseConfig.IMAGE_ALLOW_PRIVATE_ADDRESSES = True
+        BaseConfig.IMAGE_ALLOWED_PORTS = None
+
+        for run in ("cold", "warm"):
+            start = time.perf_counter()
+            prepared, stats = ImageService.prepare_images(markdown, page_url)
+            elapsed = time.perf_counter() - start
+            unique = {image["hash"]: image for image in prepared.values()}.values()
+            original = sum(image["original_bytes"] for image in unique)
+            print(
+                f"{run}: {len(prepared)} images in {elapsed:.2f}s ({len(prepared) / elapsed:.1f} images/s), "
+                f"fetched {stats['fetched']}, failed {stats['failed']}, "
+                f"{original / 1e6:.2f} MB -> {(original - stats['bytes_saved']) / 1e6:.2f} MB "
+                f"(saved {stats['bytes_saved'] / 1e6:.2f} MB)"
+            )
+
+        repeated = {path: count for path, count in hits.items() if count > 1}
+        print(f"server requests: {sum(hits.values())}, assets fetched more than once: {repeated or 'none'}")
+        assert not repeated
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark the overhead of request tracing.
+
+Measures the cost of a span outside and inside a trace, the cost of a full
+trace with a deck-sized number of spans, and checks that the ring buffer and
+per-trace span limit keep memory bounded.
+
+Run from the repository root:
+    python -m benchmarks.bench_tracing
+"""
+import time
+import tempfile
+import os
+from src.config import BaseConfig
+from src.helpers import tracing
+
+ITERATIONS = 200_000
+SPANS_PER_DECK = 40  # Roughly the upstream calls of a 10 slide deck
+
+
+def bench_span_outside_trace():
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        with tracing.span("noop"):
+            pass
+    return (time.perf_counter() - start) / ITERATIONS * 1e6
+
+
+def bench_span_inside_trace():
+    trace, token = tracing.start_trace("bench")
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        with tracing.span("noop") as current:
+            current["request_bytes"] = 1
+    elapsed = time.perf_counter() - start
+    tracing.end_trace(trace, token)
+    return elapsed / ITERATIONS * 1e6, len(trace.spans), trace.dropped_spans
+
+
+def bench_deck_trace(decks=2_000):
+    start = time.perf_counter()
+    for _ in range(decks):
+        trace, token = tracing.start_trace("POST /presentation/create")
+        for i in range(SPANS_PER_DECK):
+            with tracing.span("alai.call"):
+                with tracing.span("http.post") as current:
+                    current["request_bytes"] = i
+        tracing.end_trace(trace, token, 200)
+    return (time.perf_counter() - start) / decks * 1e3
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        BaseConfig.TRACE_SLOW_LOG_PATH = os.path.join(tmp, "slow.jsonl")
+        BaseConfig.TRACE_SLOW_THRESHOLD_MS = float("inf")
+
+        print(f"span outside a trace:   {bench_span_outside_trace():.2f} us")
+        per_span, kept, dropped = bench_span_inside_trace()
+        print(f"span inside a trace:    {per_span:.2f} us ({kept} kept, {dropped} dropped)")
+        print(f"deck trace ({SPANS_PER_DECK * 2} spans): {bench_deck_trace():.3f} ms")
+        print(f"ring buffer size:       {len(tracing.get_recent_traces(None))} / {BaseConfig.TRACE_BUFFER_SIZE}")
+
+        BaseConfig.TRACE_SLOW_THRESHOLD_MS = 0
+        start = time.perf_counter()
+        bench_deck_trace(decks=200)
+        print(f"deck trace, slow-logged: {(time.perf_counter() - start) / 200 * 1e3:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
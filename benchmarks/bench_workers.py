@@ -0,0 +1,127 @@
+"""
+Benchmark throughput scaling of the multi-process worker mode.
+
+The ALAI client is replaced by a fake upstream whose calls burn CPU instead of
+waiting on the network, so the deck pipeline in PresentationService becomes
+CPU-bound. Decks are requested concurrently for a fixed time against 1..N workers,
+then a value written through one worker is read back through the others.
+
+Run from the repository root (POSIX only):
+    python -m benchmarks.bench_workers
+"""
+import os
+import time
+import hashlib
+import tempfile
+import threading
+import requests
+from flask import Flask, jsonify, request
+from src.config import BaseConfig
+from src.clients.alai_client import ALAIClient
+from src.helpers.state_store import get_state_store
+from src.service.presentation_service import PresentationService
+from src.supervisor import Supervisor
+
+DURATION = 3  # seconds per run
+CLIENTS_PER_WORKER = 4
+UPSTREAM_WORK = 20_000  # sha256 rounds per fake upstream call
+
+
+def _burn(result):
+    def fake_call(*args, **kwargs):
+        digest = b""
+        for _ in range(UPSTREAM_WORK):
+            digest = hashlib.sha256(digest).digest()
+        return result
+    return fake_call
+
+
+def install_fake_upstream():
+    ALAIClient.create_presentation = staticmethod(_burn(({"id": "p", "slides": [{"id": "s"}]}, None)))
+    ALAIClient.get_presentation_questions = staticmethod(_burn(([], None)))
+    ALAIClient.generate_slides_outline = staticmethod(_burn([]))
+    ALAIClient.get_sample_text = staticmethod(_burn(("sample", None)))
+    ALAIClient.calibrate_tone = staticmethod(_burn(({}, None)))
+    ALAIClient.calibrate_verbosity = staticmethod(_burn(({}, None)))
+    ALAIClient.create_slides_from_outline = staticmethod(_burn([{"slides": [{"slide_outline": {}}] * 3}]))
+    ALAIClient.create_slide_variants = staticmethod(_burn([]))
+    ALAIClient.upsert_presentation_share = staticmethod(_burn(("share", None)))
+
+
+def create_bench_app():
+    app = Flask(__name__)
+
+    @app.route("/deck", methods=["POST"])
+    def deck():
+        result, status_code = PresentationService.create_presentation_from_markdown(
+            "token", request.json, "# markdown", request.json["username"]
+        )
+        return jsonify(result), status_code
+
+    @app.route("/state/<key>", methods=["PUT", "GET"])
+    def state(key):
+        if request.method == "PUT":
+            get_state_store().set("bench", key, {"pid": os.getpid()})
+        return jsonify({"value": get_state_store().get("bench", key), "pid": os.getpid()})
+
+    return app
+
+
+def run(workers):
+    supervisor = Supervisor(create_bench_app, workers=workers, host="127.0.0.1", port=0)
+    supervisor.start()
+    base_url = f"http://127.0.0.1:{supervisor.port}"
+    time.sleep(0.5)
+
+    completed = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + DURATION
+
+    def client(i):
+        session = requests.Session()
+        while time.perf_counter() < deadline:
+            response = session.post(f"{base_url}/deck", json={"username": f"user{i % 4}", "tone": "PROFESSIONAL"})
+            response.raise_for_status()
+            with lock:
+                completed[0] += 1
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(workers * CLIENTS_PER_WORKER)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    throughput = completed[0] / (time.perf_counter() - start)
+
+    # Write state through one worker and read it back through the others
+    writer = requests.put(f"{base_url}/state/shared").json()["pid"]
+    readers = set()
+    for _ in range(workers * 10):
+        response = requests.get(f"{base_url}/state/shared").json()
+        assert response["value"] == {"pid": writer}
+        readers.add(response["pid"])
+
+    supervisor.stop()
+    return throughput, len(readers)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        BaseConfig.STATE_DB_PATH = os.path.join(tmp, "state.sqlite3")
+        BaseConfig.TRACE_SLOW_LOG_PATH = None
+        install_fake_upstream()
+
+        counts = sorted({1, 2, 4, os.cpu_count() or 1})
+        baseline = None
+        for workers in counts:
+            throughput, readers = run(workers)
+            baseline = baseline or throughput
+            print(
+                f"{workers:>2} workers: {throughput:7.1f} decks/s  "
+                f"speedup {throughput / baseline:4.2f}x  "
+                f"shared state read by {readers} workers"
+            )
+
+
+if __name__ == "__main__":
+    main()
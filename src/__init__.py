@@ -1,9 +1,14 @@
 import os
 import dotenv
-from flask import Flask
+from flask import Flask, request, g
 from flasgger import Swagger
 from .routes.auth_routes import auth_bp
 from .routes.presentation_routes import presentation_bp
+from .routes.calibration_routes import calibration_bp
+from .routes.debug_routes import debug_bp
+from .routes.image_routes import image_bp
+from .helpers.tracing import start_trace, end_trace, is_valid_trace_id
+from .config import BaseConfig
 
 def create_app():
     """Application factory function for Flask app."""
@@ -19,5 +24,33 @@ def create_app():
     # Register blueprints
     app.register_blueprint(presentation_bp, url_prefix='/presentation')
     app.register_blueprint(auth_bp, url_prefix='/auth')
+    app.register_blueprint(calibration_bp, url_prefix='/calibration')
+    app.register_blueprint(debug_bp, url_prefix='/debug')
+    app.register_blueprint(image_bp, url_prefix='/images')
+    
+    # Request tracing
+    @app.before_request
+    def begin_request_trace():
+        if request.blueprint in BaseConfig.TRACE_IGNORED_BLUEPRINTS:
+            return
+        trace_id = request.headers.get("X-Trace-Id")
+        g.trace, g.trace_token = start_trace(
+            f"{request.method} {request.path}",
+            trace_id if is_valid_trace_id(trace_id) else None
+        )
+    
+    @app.after_request
+    def add_trace_header(response):
+        trace = g.get("trace")
+        if trace is not None:
+            trace.status = response.status_code
+            response.headers["X-Trace-Id"] = trace.trace_id
+        return response
+    
+    @app.teardown_request
+    def finish_request_trace(exc):
+        trace = g.pop("trace", None)
+        if trace is not None:
+            end_trace(trace, g.pop("trace_token"), 500 if exc else trace.status)
     
     return app
\ No newline at end of file
@@ -1,22 +1,31 @@
 import logging
 import asyncio
+import threading
 from ..helpers.http_request import get_request, post_request
 from ..helpers.socket_request import WebSocketClient
+from ..helpers.tracing import traced
 from ..config import BaseConfig
 
 logger = logging.getLogger(__name__)
 
+# One event loop per thread, reused across calls
+_thread_loops = threading.local()
+
 class ALAIClient:
     """Client for interacting with the ALAI API."""
     
     @staticmethod
     def run_async_task(coroutine):
-        """Run an async task from sync context."""
-        loop = asyncio.new_event_loop()
+        """Run an async task from sync context on the event loop of the current thread."""
+        loop = getattr(_thread_loops, "loop", None)
+        if loop is None or loop.is_closed():
+            loop = asyncio.new_event_loop()
+            _thread_loops.loop = loop
         asyncio.set_event_loop(loop)
         return loop.run_until_complete(coroutine)
     
     @staticmethod
+    @traced("alai.create_presentation")
     def create_presentation(access_token, presentation_id, title, theme_id=None, color_set_id=None):
         """Create a new presentation."""
         json_data = {
@@ -36,6 +45,7 @@ class ALAIClient:
         return response.json(), None
     
     @staticmethod
+    @traced("alai.get_presentation_questions")
     def get_presentation_questions(presentation_id):
         """Get questions for a presentation."""
         response = get_request(f"{BaseConfig.GET_PRESENTATION_QUESTIONS_URL}/{presentation_id}")
@@ -47,6 +57,7 @@ class ALAIClient:
         return response.json(), None
     
     @staticmethod
+    @traced("alai.get_sample_text")
     def get_sample_text(presentation_id, raw_context):
         """Get sample text for calibration."""
         json_data = {
@@ -63,6 +74,7 @@ class ALAIClient:
         return response.json().get("sample_text", ""), None
     
     @staticmethod
+    @traced("alai.calibrate_tone")
     def calibrate_tone(presentation_id, sample_text, tone_type, tone_instructions=None):
         """Calibrate tone for a presentation."""
         json_data = {
@@ -81,6 +93,7 @@ class ALAIClient:
         return response.json(), None
     
     @staticmethod
+    @traced("alai.calibrate_verbosity")
     def calibrate_verbosity(presentation_id, sample_text, verbosity_level, tone_type, tone_instructions=None):
         """Calibrate verbosity for a presentation."""
         json_data = {
@@ -101,6 +114,7 @@ class ALAIClient:
         return response.json(), None
     
     @staticmethod
+    @traced("alai.generate_slides_outline")
     def generate_slides_outline(access_token, presentation_id, instructions, questions, raw_context, slide_range):
         """Generate slides outline."""
         data = {
@@ -121,6 +135,7 @@ class ALAIClient:
         )
     
     @staticmethod
+    @traced("alai.create_slides_from_outline")
     def create_slides_from_outline(access_token, presentation_id, instructions, raw_context, 
                                   first_slide_id, slide_contexts):
         """Create slides from outline."""
@@ -144,13 +159,15 @@ class ALAIClient:
         )
     
     @staticmethod
+    @traced("alai.create_slide_variants")
     def create_slide_variants(access_token, presentation_id, slide_id, slide_title, slide_instructions, 
-                             additional_instructions=None):
+                             additional_instructions=None, images_on_slide=None):
         """Create slide variants."""
         data = {
             "auth_token": access_token,
             "additional_instructions": additional_instructions or "",
-            "images_on_slide": [], # Dont know why but if we use the scraped images the socket returns 404 image not found error
+            # Only images served from our image cache, raw scraped image URLs make the socket return 404
+            "images_on_slide": images_on_slide or [],
             "layout_type": "AI_GENERATED_LAYOUT",
             "presentation_id": presentation_id,
             "slide_id": slide_id,
@@ -167,6 +184,7 @@ class ALAIClient:
         )
     
     @staticmethod
+    @traced("alai.upsert_presentation_share")
     def upsert_presentation_share(presentation_id):
         """Upsert presentation share."""
         response = post_request(
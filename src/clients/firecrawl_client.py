@@ -1,5 +1,11 @@
 import os
 from firecrawl import FirecrawlApp
+from ..helpers.tracing import span
+from ..helpers.state_store import get_state_store
+from ..config import BaseConfig
+
+# Scrape results are cached by URL in the shared state store
+SCRAPES_NAMESPACE = "scrapes"
 
 class FirecrawlClient:
     """Client for interacting with the Firecrawl API."""
@@ -12,17 +18,30 @@ class FirecrawlClient:
         """
         Scrape a URL and return the markdown content.
         
+        Results are cached for SCRAPE_CACHE_TTL seconds and shared between workers.
+        
         Args:
             url (str): The URL to scrape.
             
         Returns:
             str: The markdown content.
         """
-        crawl_result = self.client.scrape_url(
-            url=url, 
-            params={
-                'formats': ['markdown'], 
-                'onlyMainContent': True,
-            }
-        )
-        return dict(crawl_result)['markdown']
\ No newline at end of file
+        store = get_state_store()
+        markdown = store.get(SCRAPES_NAMESPACE, url)
+        if markdown is not None:
+            return markdown
+        
+        with span("firecrawl.scrape_url", url=url) as current:
+            crawl_result = self.client.scrape_url(
+                url=url, 
+                params={
+                    'formats': ['markdown'], 
+                    'onlyMainContent': True,
+                }
+            )
+            markdown = dict(crawl_result)['markdown']
+            current["response_bytes"] = len(markdown or "")
+        
+        if markdown:
+            store.set(SCRAPES_NAMESPACE, url, markdown, ttl=BaseConfig.SCRAPE_CACHE_TTL)
+        return markdown
\ No newline at end of file
@@ -29,6 +29,52 @@ class BaseConfig:
     DEFAULT_TONE = "DEFAULT"
     DEFAULT_VERBOSITY = 3
     
+    # Calibration profile settings
+    CALIBRATION_PROFILE_TTL = 24 * 60 * 60  # seconds
+    
+    # Tracing settings
+    TRACE_BUFFER_SIZE = 100  # Number of recent traces kept in memory
+    TRACE_MAX_SPANS = 500  # Spans recorded per trace, further spans are counted as dropped
+    TRACE_SLOW_THRESHOLD_MS = 90 * 1000
+    TRACE_SLOW_LOG_PATH = "slow_requests.jsonl"
+    TRACE_IGNORED_BLUEPRINTS = ("debug", "flasgger", "images")
+    
+    # Shared state settings
+    STATE_DB_PATH = "state.sqlite3"  # SQLite database shared by all worker processes, holds ALAI tokens
+    REFRESH_TOKEN_TTL = 7 * 24 * 60 * 60  # seconds a refresh token is kept in the state store
+    STATE_DB_TIMEOUT = 30  # seconds to wait for a lock held by another worker
+    STATE_PURGE_INTERVAL = 5 * 60  # seconds between deletions of expired values
+    SCRAPE_CACHE_TTL = 60 * 60  # seconds
+    JOB_TTL = 24 * 60 * 60  # seconds
+    JOB_WORKERS = 4  # Presentation jobs run concurrently per process
+    JOB_HEARTBEAT_INTERVAL = 10  # seconds between heartbeats of the jobs a worker owns
+    JOB_HEARTBEAT_TIMEOUT = 60  # seconds without a heartbeat before a job is reported failed
+    
+    # Scraped image settings
+    IMAGE_PUBLIC_BASE_URL = None  # Public URL of this app, prepared images are only sent to ALAI when set
+    IMAGE_CACHE_DIR = "image_cache"
+    IMAGE_FETCH_WORKERS = 8
+    IMAGE_FETCH_TIMEOUT = 10  # seconds per connect or read
+    IMAGE_FETCH_DEADLINE = 20  # seconds for a whole download
+    IMAGE_WAIT_TIMEOUT = 30  # seconds deck creation waits for images once its slides are ready
+    IMAGE_CLAIM_TTL = 60  # seconds a worker holds a URL while fetching it, must exceed the download time
+    IMAGE_MAX_REDIRECTS = 3
+    IMAGE_ALLOWED_PORTS = (80, 443)  # None allows any port
+    IMAGE_ALLOW_PRIVATE_ADDRESSES = False  # Only for local testing, allows fetching from internal hosts
+    IMAGE_FAILURE_TTL = 60 * 60  # seconds before a failed image URL is retried
+    IMAGE_MAX_PER_DECK = 20
+    IMAGE_MAX_SOURCE_BYTES = 10 * 1024 * 1024
+    IMAGE_MAX_PIXELS = 40 * 1000 * 1000  # Larger images are refused before decoding
+    IMAGE_MAX_BYTES = 300 * 1024  # Size budget of a prepared image
+    IMAGE_MAX_DIMENSION = 1600  # pixels
+    IMAGE_MIN_DIMENSION = 200  # pixels, images are not shrunk further to meet the size budget
+    IMAGE_QUALITY_STEPS = (85, 75, 65)  # JPEG qualities tried before shrinking
+    
+    # Worker mode settings
+    WORKER_COUNT = 4
+    WORKER_HOST = "127.0.0.1"
+    WORKER_PORT = 5500
+    
 
 class DevelopmentConfig(BaseConfig):
     """Development configuration."""
@@ -1,4 +1,5 @@
 from ..functions.auth import get_user_token
+from ..helpers.tracing import set_trace_user
 from flask import request, g, jsonify
 from functools import wraps
 
@@ -15,6 +16,8 @@ def auth_required(f):
             return jsonify({"error": "Authentication required"}), 401
 
         g.access_token = token
+        g.username = username
+        set_trace_user(username)
         return f(*args, **kwargs)
 
     wrapper.__name__ = f.__name__
@@ -1,10 +1,38 @@
 import time
 from ..helpers import http_request
+from ..helpers.state_store import get_state_store
+from ..config import BaseConfig
 import os
 from flask import g, session
 
 AUTH_URL = "https://api.getalai.com/auth/v1/token?grant_type=password"
 
+# Tokens are kept in the shared state store so a refresh on one worker is seen by all.
+# Access tokens expire with the token itself, refresh tokens after REFRESH_TOKEN_TTL.
+TOKENS_NAMESPACE = "tokens"
+REFRESH_TOKENS_NAMESPACE = "refresh_tokens"
+
+
+def _store_tokens(username, access_token, refresh_token, expires_at):
+    """Save a user's tokens in the session and the shared state store."""
+    session[username] = {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "expires_at": expires_at,
+    }
+    store = get_state_store()
+    store.set(
+        TOKENS_NAMESPACE, username,
+        {"access_token": access_token, "expires_at": expires_at},
+        ttl=max(expires_at - time.time(), 0)
+    )
+    store.set(
+        REFRESH_TOKENS_NAMESPACE, username,
+        {"refresh_token": refresh_token},
+        ttl=BaseConfig.REFRESH_TOKEN_TTL
+    )
+
+
 def authenticate(username, password):
     """Authenticate user with third-party API."""
     response = http_request.post_request(
@@ -18,11 +46,7 @@ def authenticate(username, password):
     )
     if response.status_code == 200:
         data = response.json()
-        session[username] = {
-            "access_token": data["access_token"],
-            "refresh_token": data["refresh_token"],
-            "expires_at": data["expires_at"],
-        }
+        _store_tokens(username, data["access_token"], data["refresh_token"], data["expires_at"])
         return data
     return None
 
@@ -32,7 +56,8 @@ def refresh_token(username):
     if username not in session:
         return None
 
-    refresh_token = session[username]["refresh_token"]
+    tokens = get_state_store().get(REFRESH_TOKENS_NAMESPACE, username, session[username])
+    refresh_token = tokens["refresh_token"]
     refresh_response = http_request.post_request(
         AUTH_URL,
         data={
@@ -43,8 +68,12 @@ def refresh_token(username):
 
     if refresh_response.status_code == 200:
         data = refresh_response.json()
-        session[username]["access_token"] = data["access_token"]
-        session[username]["expires_at"] = data["expires_at"]
+        _store_tokens(
+            username,
+            data["access_token"],
+            data.get("refresh_token", refresh_token),
+            data["expires_at"]
+        )
         return data["access_token"]
     
     return None
@@ -55,7 +84,7 @@ def get_user_token(username):
     if username not in session:
         return None
 
-    user_session = session[username]
+    user_session = get_state_store().get(TOKENS_NAMESPACE, username, session[username])
     current_time = time.time()
 
     if user_session["expires_at"] < current_time:  # Token expired
@@ -0,0 +1,90 @@
+import time
+import json
+import hashlib
+from ..config import BaseConfig
+from ..helpers.state_store import get_state_store
+
+# Calibration profiles are stored under the JSON array [username, profile name], so
+# usernames and profile names can contain any character without keys colliding
+PROFILES_NAMESPACE = "calibration_profiles"
+
+
+def _profile_key(username, name):
+    return json.dumps([username, name])
+
+
+def _user_prefix(username):
+    """Return the key prefix shared by all of a user's profiles, and no other user's."""
+    return _profile_key(username, "")[:-len('""]')]
+
+
+def get_profile_name(tone, verbosity, tone_instructions=None):
+    """Build the default profile name for a tone/verbosity pair."""
+    name = f"{tone}-{verbosity}"
+    if tone_instructions:
+        name = f"{name}-{hashlib.sha1(tone_instructions.encode()).hexdigest()[:8]}"
+    return name
+
+
+def get_profile(username, name):
+    """Return the stored calibration profile for a user, or None."""
+    return get_state_store().get(PROFILES_NAMESPACE, _profile_key(username, name))
+
+
+def save_profile(username, name, tone, verbosity, tone_instructions, sample_text, sample_text_ms):
+    """Store a calibration profile for a user."""
+    profile = {
+        "name": name,
+        "tone": tone,
+        "verbosity": verbosity,
+        "tone_instructions": tone_instructions,
+        "sample_text": sample_text,
+        "sample_text_ms": sample_text_ms,
+        "created_at": time.time(),
+        "uses": 0,
+        "ms_saved": 0,
+    }
+    get_state_store().set(
+        PROFILES_NAMESPACE,
+        _profile_key(username, name),
+        profile,
+        ttl=BaseConfig.CALIBRATION_PROFILE_TTL
+    )
+    return profile
+
+
+def record_profile_use(username, name, ms_saved):
+    """Record that a profile was applied to a presentation."""
+    def update(profile):
+        if profile is None:
+            return None
+        profile["uses"] += 1
+        profile["ms_saved"] += ms_saved
+        return profile
+
+    get_state_store().update(PROFILES_NAMESPACE, _profile_key(username, name), update)
+
+
+def list_profiles(username):
+    """List the calibration profiles stored for a user."""
+    profiles = [profile for _, profile in get_state_store().items(PROFILES_NAMESPACE, _user_prefix(username))]
+    for profile in profiles:
+        profile.pop("sample_text", None)
+    return sorted(profiles, key=lambda p: p["name"])
+
+
+def invalidate_profile(username, name=None):
+    """
+    Remove calibration profiles for a user.
+
+    Args:
+        username (str): The user owning the profiles.
+        name (str, optional): The profile to remove. Removes all of the user's profiles if omitted.
+
+    Returns:
+        int: The number of profiles removed.
+    """
+    store = get_state_store()
+    if name is None:
+        return store.delete_prefix(PROFILES_NAMESPACE, _user_prefix(username))
+    return int(store.delete(PROFILES_NAMESPACE, _profile_key(username, name)))
@@ -1,5 +1,6 @@
 import requests
 from flask import g
+from .tracing import span
 
 
 def get_default_header() -> dict:
@@ -14,6 +15,12 @@ def get_default_header() -> dict:
         "Content-Type": "application/json"
     }
 
+def _record_response(current_span: dict, response: requests.Response) -> None:
+    """Record the status code and body sizes of a response on a tracing span."""
+    current_span["status_code"] = response.status_code
+    current_span["request_bytes"] = len(response.request.body or b"")
+    current_span["response_bytes"] = len(response.content)
+
 def post_request(url: str, data: dict, headers: dict = None) -> requests.Response:
     """
     Sends a POST request to the specified URL with the given data and headers.
@@ -28,8 +35,10 @@ def post_request(url: str, data: dict, headers: dict = None) -> requests.Respons
     """
     if headers is None:
         headers = get_default_header()
-    response = requests.post(url, json=data, headers=headers)
-    response.raise_for_status()
+    with span("http.post", url=url) as current:
+        response = requests.post(url, json=data, headers=headers)
+        _record_response(current, response)
+        response.raise_for_status()
     return response
 
 def get_request(url: str, headers: dict = None, data: dict = None) -> requests.Response:
@@ -45,6 +54,8 @@ def get_request(url: str, headers: dict = None, data: dict = None) -> requests.R
     """
     if headers is None:
         headers = get_default_header()
-    response = requests.get(url, headers=headers, json=data)
-    response.raise_for_status()
+    with span("http.get", url=url) as current:
+        response = requests.get(url, headers=headers, json=data)
+        _record_response(current, response)
+        response.raise_for_status()
     return response
\ No newline at end of file
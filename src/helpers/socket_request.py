@@ -1,47 +1,62 @@
 import json
+import logging
 from typing import Dict, List, Optional
 import websockets
+from .tracing import span, get_trace_id
+
+logger = logging.getLogger(__name__)
 
 
 class WebSocketClient:
     """Client for connecting to external WebSocket services."""
-    
+
     @staticmethod
     async def connect_and_listen(ws_url: str, data: Dict, headers: Optional[Dict] = None) -> List[Dict]:
         """
         Connect to a WebSocket and listen for all messages until connection closes.
-        
+
         Args:
             ws_url: URL of the WebSocket to connect to
             headers: Optional headers for the WebSocket connection
-            
+
         Returns:
             List of received messages
         """
         messages = []
-        try:
-            async with websockets.connect(ws_url, additional_headers=headers) as websocket:
-                print(f"Connected to WebSocket at {ws_url}")
-                
-                while True:
-                    try:
-                        await websocket.send(json.dumps(data), text=True)  # Send initial data
-                        message = await websocket.recv()
-                        print(f"Received message: {message[:100]}...")
-                        
-                        # Try to parse JSON, but store raw message if not JSON
+        payload = json.dumps(data)
+        with span("ws.connect_and_listen", url=ws_url) as current:
+            request_bytes = 0
+            response_bytes = 0
+            try:
+                async with websockets.connect(ws_url, additional_headers=headers) as websocket:
+                    logger.info(f"[trace {get_trace_id()}] Connected to WebSocket at {ws_url}")
+
+                    while True:
                         try:
-                            parsed_message = json.loads(message)
-                            messages.append(parsed_message)
-                        except json.JSONDecodeError:
-                            messages.append({"raw_message": message})
-                            
-                    except websockets.ConnectionClosed:
-                        print("WebSocket connection closed by server")
-                        break
-                        
-        except Exception as e:
-            print(f"Error in WebSocket connection: {str(e)}")
-            messages.append({"error": str(e)})
-            
-        return messages
\ No newline at end of file
+                            await websocket.send(payload, text=True)  # Send initial data
+                            request_bytes += len(payload)
+                            message = await websocket.recv()
+                            response_bytes += len(message)
+                            logger.debug(f"[trace {get_trace_id()}] Received message: {message[:100]}...")
+
+                            # Try to parse JSON, but store raw message if not JSON
+                            try:
+                                parsed_message = json.loads(message)
+                                messages.append(parsed_message)
+                            except json.JSONDecodeError:
+                                messages.append({"raw_message": message})
+
+                        except websockets.ConnectionClosed:
+                            logger.info(f"[trace {get_trace_id()}] WebSocket connection closed by server")
+                            break
+
+            except Exception as e:
+                logger.error(f"[trace {get_trace_id()}] Error in WebSocket connection: {str(e)}")
+                messages.append({"error": str(e)})
+                current["error"] = str(e)
+
+            current["request_bytes"] = request_bytes
+            current["response_bytes"] = response_bytes
+            current["messages"] = len(messages)
+
+        return messages
@@ -0,0 +1,177 @@
+import os
+import stat
+import json
+import time
+import logging
+import sqlite3
+import threading
+from ..config import BaseConfig
+
+logger = logging.getLogger(__name__)
+
+
+class StateStore:
+    """
+    Key/value store for state shared between worker processes.
+
+    Values are JSON documents grouped by namespace and stored in a SQLite database,
+    so every worker started by the supervisor sees the same tokens, scrape results,
+    calibration profiles and job state. Each thread of each process uses its own
+    connection. The database holds ALAI tokens, so it is created readable by the
+    owner only and must be kept at a private path.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the store.
+
+        Args:
+            path (str): Path of the SQLite database file.
+        """
+        self.path = path
+        self._local = threading.local()
+        self._last_purge = 0
+        self._inherited = []
+        if not os.path.exists(path):
+            os.close(os.open(path, os.O_CREAT | os.O_WRONLY, 0o600))
+        elif os.stat(path).st_mode & (stat.S_IRWXG | stat.S_IRWXO):
+            logger.warning(f"State database {path} is accessible by other users, it should be mode 0600")
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS state ("
+                " namespace TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " expires_at REAL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+
+    def _connection(self):
+        """Return the connection of the current thread, reopening it after a fork."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid != os.getpid():
+            # A connection inherited across fork must not be used or closed in the child
+            self._inherited.append(conn)
+            conn = None
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=BaseConfig.STATE_DB_TIMEOUT, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def _expires_at(ttl):
+        return time.time() + ttl if ttl is not None else None
+
+    def get(self, namespace, key, default=None):
+        """Return the value stored under a key, or the default if missing or expired."""
+        row = self._connection().execute(
+            "SELECT value FROM state WHERE namespace = ? AND key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (namespace, key, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set(self, namespace, key, value, ttl=None):
+        """
+        Store a value under a key.
+
+        Args:
+            namespace (str): The namespace of the key.
+            key (str): The key.
+            value: A JSON-serialisable value.
+            ttl (float, optional): Seconds until the value expires. Never expires if omitted.
+        """
+        self._connection().execute(
+            "INSERT OR REPLACE INTO state (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+            (namespace, key, json.dumps(value), self._expires_at(ttl))
+        )
+        self._purge_if_due()
+
+    def update(self, namespace, key, update_fn, ttl=None):
+        """
+        Atomically read, modify and write a value.
+
+        Args:
+            namespace (str): The namespace of the key.
+            key (str): The key.
+            update_fn (callable): Called with the current value (or None) and returns the
+                new value. Returning None leaves the stored value unchanged.
+            ttl (float, optional): Seconds until the value expires. Keeps the current expiry if omitted.
+
+        Returns:
+            The new value, or None if nothing was written.
+        """
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT value, expires_at FROM state WHERE namespace = ? AND key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (namespace, key, time.time())
+            ).fetchone()
+            value = update_fn(json.loads(row[0]) if row else None)
+            if value is not None:
+                expires_at = self._expires_at(ttl) if ttl is not None or not row else row[1]
+                conn.execute(
+                    "INSERT OR REPLACE INTO state (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                    (namespace, key, json.dumps(value), expires_at)
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return value
+
+    def delete(self, namespace, key):
+        """Delete a key. Returns True if it existed."""
+        cursor = self._connection().execute(
+            "DELETE FROM state WHERE namespace = ? AND key = ?",
+            (namespace, key)
+        )
+        return cursor.rowcount > 0
+
+    def items(self, namespace, prefix=""):
+        """Return the (key, value) pairs of a namespace whose keys start with a prefix."""
+        rows = self._connection().execute(
+            "SELECT key, value FROM state WHERE namespace = ? AND substr(key, 1, ?) = ?"
+            " AND (expires_at IS NULL OR expires_at > ?) ORDER BY key",
+            (namespace, len(prefix), prefix, time.time())
+        ).fetchall()
+        return [(key, json.loads(value)) for key, value in rows]
+
+    def delete_prefix(self, namespace, prefix=""):
+        """Delete every key of a namespace starting with a prefix. Returns the number deleted."""
+        cursor = self._connection().execute(
+            "DELETE FROM state WHERE namespace = ? AND substr(key, 1, ?) = ?",
+            (namespace, len(prefix), prefix)
+        )
+        return cursor.rowcount
+
+    def _purge_if_due(self):
+        """Delete expired values at most once every STATE_PURGE_INTERVAL seconds per process."""
+        if time.time() - self._last_purge >= BaseConfig.STATE_PURGE_INTERVAL:
+            self._last_purge = time.time()
+            self.purge_expired()
+
+    def purge_expired(self):
+        """Delete expired values. Returns the number deleted."""
+        cursor = self._connection().execute(
+            "DELETE FROM state WHERE expires_at IS NOT NULL AND expires_at <= ?",
+            (time.time(),)
+        )
+        return cursor.rowcount
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_state_store():
+    """Return the shared state store of this process."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = StateStore(BaseConfig.STATE_DB_PATH)
+    return _store
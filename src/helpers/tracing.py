@@ -0,0 +1,181 @@
+import re
+import json
+import time
+import uuid
+import logging
+import threading
+import itertools
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from ..config import BaseConfig
+
+logger = logging.getLogger(__name__)
+
+_current_trace = contextvars.ContextVar("current_trace", default=None)
+_current_span = contextvars.ContextVar("current_span", default=None)
+_span_ids = itertools.count(1)
+
+# Client-supplied trace ids are only reused when they match this pattern
+TRACE_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{8,64}$')
+
+# Ring buffer of recently finished traces
+_recent_traces = deque(maxlen=BaseConfig.TRACE_BUFFER_SIZE)
+_recent_traces_lock = threading.Lock()
+_slow_log_lock = threading.Lock()
+
+
+class Trace:
+    """A request trace holding the spans recorded for its upstream calls."""
+
+    def __init__(self, name, trace_id=None, username=None):
+        self.trace_id = trace_id or uuid.uuid4().hex
+        self.name = name
+        self.username = username
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.duration_ms = None
+        self.status = None
+        self.spans = []
+        self.dropped_spans = 0
+
+    def add_span(self, span):
+        """Attach a span, dropping it once the per-trace span limit is reached."""
+        if len(self.spans) >= BaseConfig.TRACE_MAX_SPANS:
+            self.dropped_spans += 1
+            return False
+        self.spans.append(span)
+        return True
+
+    def to_dict(self):
+        """Return a JSON-serialisable view of the trace."""
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "username": self.username,
+            "started_at": self.started_at,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "spans": sorted((dict(span) for span in self.spans), key=lambda s: s["offset_ms"]),
+            "dropped_spans": self.dropped_spans,
+        }
+
+
+def get_trace_id():
+    """Return the id of the active trace, or None."""
+    trace = _current_trace.get()
+    return trace.trace_id if trace else None
+
+
+def is_valid_trace_id(trace_id):
+    """Return True if a client-supplied trace id can be reused."""
+    return bool(trace_id) and TRACE_ID_PATTERN.match(trace_id) is not None
+
+
+def set_trace_user(username):
+    """Record the authenticated user on the active trace."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.username = username
+
+
+def start_trace(name, trace_id=None, username=None):
+    """
+    Start a new trace and make it the active trace for the current context.
+
+    Returns:
+        tuple: (Trace, token) - pass the token to `end_trace`.
+    """
+    trace = Trace(name, trace_id, username)
+    return trace, _current_trace.set(trace)
+
+
+def end_trace(trace, token, status=None):
+    """Finish a trace, store it in the ring buffer and log it if it was slow."""
+    _current_trace.reset(token)
+    trace.duration_ms = round((time.perf_counter() - trace.start) * 1000, 2)
+    trace.status = status
+
+    with _recent_traces_lock:
+        _recent_traces.append(trace)
+
+    if trace.duration_ms >= BaseConfig.TRACE_SLOW_THRESHOLD_MS:
+        _write_slow_trace(trace)
+
+
+def _write_slow_trace(trace):
+    """Append a slow trace to the JSONL slow-request log."""
+    path = BaseConfig.TRACE_SLOW_LOG_PATH
+    if not path:
+        return
+    line = json.dumps(trace.to_dict(), default=str)
+    try:
+        with _slow_log_lock, open(path, "a") as slow_log:
+            slow_log.write(line + "\n")
+    except OSError as e:
+        logger.error(f"Failed to write slow trace {trace.trace_id}: {e}")
+
+
+@contextmanager
+def span(name, **attributes):
+    """
+    Record a span on the active trace.
+
+    Yields a dict that the caller can add attributes to, such as request_bytes,
+    response_bytes or messages. Outside of a trace the span is not recorded.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield {}
+        return
+
+    parent = _current_span.get()
+    current = {
+        "name": name,
+        "span_id": next(_span_ids),
+        "parent_id": parent["span_id"] if parent else None,
+        "offset_ms": round((time.perf_counter() - trace.start) * 1000, 2),
+    }
+    current.update(attributes)
+    token = _current_span.set(current)
+    start = time.perf_counter()
+    try:
+        yield current
+    except Exception as e:
+        current["error"] = str(e)
+        raise
+    finally:
+        current["duration_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        _current_span.reset(token)
+        trace.add_span(current)
+
+
+def traced(name):
+    """Decorator that records a span around each call of the wrapped function."""
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return f(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def get_recent_traces(username, limit=None):
+    """Return the most recent traces of a user, newest first."""
+    with _recent_traces_lock:
+        traces = [trace for trace in _recent_traces if trace.username == username]
+    traces.reverse()
+    if limit is not None:
+        traces = traces[:limit]
+    return [trace.to_dict() for trace in traces]
+
+
+def get_trace(trace_id, username):
+    """Return a trace of a user from the ring buffer by id, or None."""
+    with _recent_traces_lock:
+        for trace in _recent_traces:
+            if trace.trace_id == trace_id and trace.username == username:
+                return trace.to_dict()
+    return None
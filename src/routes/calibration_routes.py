@@ -0,0 +1,99 @@
+from flask import Blueprint, jsonify, g
+from ..decorators.auth_decorator import auth_required
+from ..functions.calibration import list_profiles, invalidate_profile
+
+calibration_bp = Blueprint('calibration', __name__)
+
+@calibration_bp.route("/profiles", methods=["GET"])
+@auth_required
+def get_profiles():
+    """
+    List the calibration profiles stored for the current user.
+    ---
+    tags:
+      - Calibration
+    parameters:
+      - name: X-Username
+        in: header
+        type: string
+        required: true
+    responses:
+      200:
+        description: Stored calibration profiles
+        schema:
+          type: object
+          properties:
+            profiles:
+              type: array
+              items:
+                type: object
+                properties:
+                  name:
+                    type: string
+                  tone:
+                    type: string
+                  verbosity:
+                    type: integer
+                  sample_text_ms:
+                    type: integer
+                  uses:
+                    type: integer
+                  ms_saved:
+                    type: integer
+      401:
+        description: Unauthorized
+    """
+    return jsonify({"profiles": list_profiles(g.username)})
+
+
+@calibration_bp.route("/profiles", methods=["DELETE"])
+@auth_required
+def delete_profiles():
+    """
+    Invalidate all calibration profiles for the current user.
+    ---
+    tags:
+      - Calibration
+    parameters:
+      - name: X-Username
+        in: header
+        type: string
+        required: true
+    responses:
+      200:
+        description: Profiles invalidated
+      401:
+        description: Unauthorized
+    """
+    return jsonify({"invalidated": invalidate_profile(g.username)})
+
+
+@calibration_bp.route("/profiles/<name>", methods=["DELETE"])
+@auth_required
+def delete_profile(name):
+    """
+    Invalidate a single calibration profile for the current user.
+    ---
+    tags:
+      - Calibration
+    parameters:
+      - name: X-Username
+        in: header
+        type: string
+        required: true
+      - name: name
+        in: path
+        type: string
+        required: true
+        example: "PROFESSIONAL-3"
+    responses:
+      200:
+        description: Profile invalidated
+      404:
+        description: Profile not found
+      401:
+        description: Unauthorized
+    """
+    if not invalidate_profile(g.username, name):
+        return jsonify({"error": "Profile not found"}), 404
+    return jsonify({"invalidated": 1})
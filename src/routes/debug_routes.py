@@ -0,0 +1,63 @@
+from flask import Blueprint, request, jsonify, g
+from ..decorators.auth_decorator import auth_required
+from ..helpers.tracing import get_recent_traces, get_trace
+
+debug_bp = Blueprint('debug', __name__)
+
+@debug_bp.route("/traces", methods=["GET"])
+@auth_required
+def list_traces():
+    """
+    List the current user's most recent request traces, newest first.
+    ---
+    tags:
+      - Debug
+    parameters:
+      - name: X-Username
+        in: header
+        type: string
+        required: true
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        example: 20
+    responses:
+      200:
+        description: Recent traces with their spans
+      401:
+        description: Unauthorized
+    """
+    limit = request.args.get("limit", type=int)
+    return jsonify({"traces": get_recent_traces(g.username, limit)})
+
+
+@debug_bp.route("/traces/<trace_id>", methods=["GET"])
+@auth_required
+def show_trace(trace_id):
+    """
+    Get one of the current user's request traces by id.
+    ---
+    tags:
+      - Debug
+    parameters:
+      - name: X-Username
+        in: header
+        type: string
+        required: true
+      - name: trace_id
+        in: path
+        type: string
+        required: true
+    responses:
+      200:
+        description: The trace with its spans
+      404:
+        description: Trace not found
+      401:
+        description: Unauthorized
+    """
+    trace = get_trace(trace_id, g.username)
+    if trace is None:
+        return jsonify({"error": "Trace not found"}), 404
+    return jsonify(trace)
@@ -0,0 +1,31 @@
+import os
+from flask import Blueprint, jsonify, send_file
+from ..service.image_service import ImageService
+
+image_bp = Blueprint('images', __name__)
+
+@image_bp.route("/<content_hash>", methods=["GET"])
+def get_image(content_hash):
+    """
+    Serve a prepared scraped image by content hash.
+    Slides reference these URLs in `images_on_slide`, so no authentication is required.
+    ---
+    tags:
+      - Images
+    parameters:
+      - name: content_hash
+        in: path
+        type: string
+        required: true
+    responses:
+      200:
+        description: The prepared image
+      404:
+        description: Image not found
+    """
+    path = ImageService.get_image_path(content_hash)
+    if path is None or not os.path.exists(path):
+        return jsonify({"error": "Image not found"}), 404
+    
+    # Content-addressed, so the image never changes
+    return send_file(os.path.abspath(path), max_age=365 * 24 * 60 * 60)
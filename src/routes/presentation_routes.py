@@ -1,7 +1,8 @@
-from flask import Blueprint, request, jsonify, g
+from flask import Blueprint, request, jsonify, g, current_app
 from ..decorators.auth_decorator import auth_required
 from ..clients.firecrawl_client import FirecrawlClient
 from ..service.presentation_service import PresentationService
+from ..service.job_service import JobService
 
 presentation_bp = Blueprint('presentation', __name__)
 
@@ -43,6 +44,9 @@ def create_presentation():
             instructions:
               type: string
               example: "Focus on key points"
+            calibration_profile:
+              type: string
+              example: "PROFESSIONAL-3"
     responses:
       200:
         description: Presentation created successfully
@@ -61,6 +65,10 @@ def create_presentation():
     if not url:
         return jsonify({"error": "URL is required"}), 400
         
+    error = PresentationService.check_calibration(g.username, request_json)
+    if error:
+        return jsonify({"error": error}), 400
+        
     # Scrape URL
     firecrawl_client = FirecrawlClient()
     markdown_data = firecrawl_client.scrape_url(url)
@@ -69,7 +77,110 @@ def create_presentation():
     result, status_code = PresentationService.create_presentation_from_markdown(
         g.access_token, 
         request_json, 
-        markdown_data
+        markdown_data,
+        g.username
+    )
+    
+    return jsonify(result), status_code
+
+
+@presentation_bp.route("/jobs", methods=["POST"])
+@auth_required
+def create_presentation_job():
+    """
+    Start creating a presentation from a URL in the background.
+    The job can be polled from any worker.
+    ---
+    tags:
+      - Presentation
+    parameters:
+      - name: X-Username
+        in: header
+        type: string
+        required: true
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          properties:
+            url:
+              type: string
+              example: "https://example.com"
+            title:
+              type: string
+              example: "My Presentation"
+            num_of_slides:
+              type: integer
+              example: 5
+            tone:
+              type: string
+              example: "PROFESSIONAL"
+            verbosity:
+              type: integer
+              example: 3
+            instructions:
+              type: string
+              example: "Focus on key points"
+            calibration_profile:
+              type: string
+              example: "PROFESSIONAL-3"
+    responses:
+      202:
+        description: Job started
+      400:
+        description: Bad request
+      401:
+        description: Unauthorized
+    """
+    request_json = request.json
+    if not request_json:
+        return jsonify({"error": "No data provided"}), 400
+        
+    if not request_json.get("url"):
+        return jsonify({"error": "URL is required"}), 400
+    
+    error = PresentationService.check_calibration(g.username, request_json)
+    if error:
+        return jsonify({"error": error}), 400
+    
+    job = JobService.start_presentation_job(
+        current_app._get_current_object(),
+        g.access_token,
+        g.username,
+        request_json
     )
     
-    return jsonify(result), status_code
\ No newline at end of file
+    return jsonify(job), 202
+
+
+@presentation_bp.route("/jobs/<job_id>", methods=["GET"])
+@auth_required
+def get_presentation_job(job_id):
+    """
+    Get the status of a presentation job.
+    ---
+    tags:
+      - Presentation
+    parameters:
+      - name: X-Username
+        in: header
+        type: string
+        required: true
+      - name: job_id
+        in: path
+        type: string
+        required: true
+    responses:
+      200:
+        description: The job, with its result once finished
+      404:
+        description: Job not found
+      401:
+        description: Unauthorized
+    """
+    job = JobService.get_job(job_id, g.username)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    
+    return jsonify(job)
\ No newline at end of file
@@ -0,0 +1,459 @@
+import io
+import os
+import re
+import time
+import socket
+import hashlib
+import logging
+import ipaddress
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from PIL import Image
+from ..config import BaseConfig
+from ..helpers.state_store import get_state_store
+from ..helpers.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Source URL -> fetch state ({"status": "fetching" | "ready" | "failed", ...})
+IMAGE_URLS_NAMESPACE = "image_urls"
+# Content hash -> prepared image metadata
+IMAGES_NAMESPACE = "images"
+
+MARKDOWN_IMAGE_PATTERN = re.compile(r'!\[([^\]]*)\]\(\s*<?([^)\s>]+)>?(?:\s+["\'][^"\']*["\'])?\s*\)')
+HTML_IMAGE_PATTERN = re.compile(r'<img\s[^>]*?src=["\']([^"\']+)["\'][^>]*>', re.IGNORECASE)
+CONTENT_HASH_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+_fetch_executor = ThreadPoolExecutor(max_workers=BaseConfig.IMAGE_FETCH_WORKERS, thread_name_prefix="image-fetch")
+_ingest_executor = ThreadPoolExecutor(max_workers=BaseConfig.JOB_WORKERS, thread_name_prefix="image-ingest")
+_sessions = threading.local()
+_fetch_sockets = threading.local()
+
+
+class UnsafeImageURLError(ValueError):
+    """Raised for image URLs that must not be fetched from the server."""
+
+
+def _watch_socket(sock):
+    """Register a socket with the fetch running on this thread, so its deadline can interrupt it."""
+    sockets = getattr(_fetch_sockets, "sockets", None)
+    if sockets is not None and sock is not None:
+        sockets.append(sock)
+
+
+def _shutdown_sockets(sockets):
+    """Shut down the sockets of a fetch, waking any read blocked on them."""
+    for sock in list(sockets):
+        try:
+            # socket.socket.shutdown leaves the TLS state of an SSL socket alone
+            socket.socket.shutdown(sock, socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+def _check_address(address):
+    """Reject addresses that are not publicly routable (loopback, private, link-local, ...)."""
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if not ip.is_global and not BaseConfig.IMAGE_ALLOW_PRIVATE_ADDRESSES:
+        raise UnsafeImageURLError(f"Image host resolves to non-public address {address}")
+
+
+class _PublicHTTPConnection(HTTPConnection):
+    """
+    Connection that refuses to talk to non-public addresses. The host's addresses are
+    checked before connecting, and the connected peer again in case DNS changed in between.
+    """
+
+    def _new_conn(self):
+        for info in socket.getaddrinfo(self.host, self.port, type=socket.SOCK_STREAM):
+            _check_address(info[4][0])
+        sock = super()._new_conn()
+        try:
+            _check_address(sock.getpeername()[0])
+        except UnsafeImageURLError:
+            sock.close()
+            raise
+        return sock
+
+    def getresponse(self, *args, **kwargs):
+        # Pooled connections are reused, so register the socket for every response
+        _watch_socket(self.sock)
+        return super().getresponse(*args, **kwargs)
+
+
+class _PublicHTTPSConnection(_PublicHTTPConnection, HTTPSConnection):
+    pass
+
+
+class _PublicHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _PublicHTTPConnection
+
+
+class _PublicHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _PublicHTTPSConnection
+
+
+class _PublicAddressAdapter(HTTPAdapter):
+    """Transport adapter that only connects to public addresses."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _PublicHTTPConnectionPool,
+            "https": _PublicHTTPSConnectionPool,
+        }
+
+
+def _get_session():
+    """Return the image fetching session of the current thread."""
+    session = getattr(_sessions, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.trust_env = False  # A proxy from the environment would bypass the address checks
+        adapter = _PublicAddressAdapter()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _sessions.session = session
+    return session
+
+
+class ImageService:
+    """Service for turning images referenced by scraped pages into slide-ready images."""
+
+    @staticmethod
+    def extract_image_urls(markdown_data, page_url=None):
+        """
+        Extract image references from scraped markdown.
+
+        Args:
+            markdown_data (str): The markdown returned by Firecrawl.
+            page_url (str, optional): The scraped page, used to resolve relative references.
+
+        Returns:
+            list: (url, alt text) tuples, de-duplicated and in page order.
+        """
+        references = []
+        for match in MARKDOWN_IMAGE_PATTERN.finditer(markdown_data or ""):
+            references.append((match.start(), match.group(2), match.group(1).strip()))
+        for match in HTML_IMAGE_PATTERN.finditer(markdown_data or ""):
+            references.append((match.start(), match.group(1), ""))
+
+        images = []
+        seen = set()
+        for _, url, alt in sorted(references):
+            url = urljoin(page_url, url) if page_url else url
+            if urlparse(url).scheme not in ("http", "https") or url in seen:
+                continue
+            seen.add(url)
+            images.append((url, alt))
+        return images[:BaseConfig.IMAGE_MAX_PER_DECK]
+
+    @staticmethod
+    def get_image_path(content_hash):
+        """Return the cache path of a prepared image, or None for an invalid hash."""
+        if not CONTENT_HASH_PATTERN.match(content_hash or ""):
+            return None
+        metadata = get_state_store().get(IMAGES_NAMESPACE, content_hash)
+        if metadata is None:
+            return None
+        return os.path.join(BaseConfig.IMAGE_CACHE_DIR, metadata["file_name"])
+
+    @staticmethod
+    def _check_url(url):
+        """Reject image URLs with a scheme or port the server must not fetch."""
+        parsed = urlparse(url)
+        if parsed.scheme not in ("http", "https") or not parsed.hostname:
+            raise UnsafeImageURLError(f"Unsupported image URL {url}")
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        if BaseConfig.IMAGE_ALLOWED_PORTS and port not in BaseConfig.IMAGE_ALLOWED_PORTS:
+            raise UnsafeImageURLError(f"Image URL port {port} is not allowed")
+
+    @staticmethod
+    def _fetch(url):
+        """
+        Download an image from a public address.
+
+        Redirects are followed by hand so every hop is checked. The response must be an
+        image and the whole download must finish within IMAGE_FETCH_DEADLINE seconds and
+        IMAGE_MAX_SOURCE_BYTES. Read timeouts only bound the gap between two packets, so
+        the connection is shut down once the deadline passes.
+        """
+        deadline = time.monotonic() + BaseConfig.IMAGE_FETCH_DEADLINE
+        sockets = _fetch_sockets.sockets = []
+        timer = threading.Timer(BaseConfig.IMAGE_FETCH_DEADLINE, _shutdown_sockets, args=(sockets,))
+        timer.daemon = True
+        timer.start()
+        try:
+            return ImageService._download(url, deadline)
+        except requests.RequestException as e:
+            if time.monotonic() > deadline:
+                raise ValueError(f"Image download took longer than {BaseConfig.IMAGE_FETCH_DEADLINE} seconds") from e
+            raise
+        finally:
+            timer.cancel()
+            _fetch_sockets.sockets = None
+
+    @staticmethod
+    def _download(url, deadline):
+        """Download an image for `_fetch`, following redirects and enforcing the limits."""
+        with span("image.fetch", url=url) as current:
+            for _ in range(BaseConfig.IMAGE_MAX_REDIRECTS + 1):
+                ImageService._check_url(url)
+                response = _get_session().get(
+                    url, stream=True, allow_redirects=False, timeout=BaseConfig.IMAGE_FETCH_TIMEOUT
+                )
+                if not response.is_redirect:
+                    break
+                response.close()
+                url = urljoin(url, response.headers["Location"])
+            else:
+                raise ValueError("Too many redirects")
+
+            with response:
+                current["status_code"] = response.status_code
+                response.raise_for_status()
+
+                content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+                if not content_type.startswith("image/") or content_type == "image/svg+xml":
+                    raise ValueError(f"Unsupported image content type {content_type!r}")
+
+                chunks = []
+                size = 0
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    size += len(chunk)
+                    if size > BaseConfig.IMAGE_MAX_SOURCE_BYTES:
+                        raise ValueError(f"Image larger than {BaseConfig.IMAGE_MAX_SOURCE_BYTES} bytes")
+                    if time.monotonic() > deadline:
+                        raise ValueError(f"Image download took longer than {BaseConfig.IMAGE_FETCH_DEADLINE} seconds")
+                    chunks.append(chunk)
+            # A connection shut down at the deadline can look like the end of the body
+            if time.monotonic() > deadline:
+                raise ValueError(f"Image download took longer than {BaseConfig.IMAGE_FETCH_DEADLINE} seconds")
+            current["response_bytes"] = size
+            return b"".join(chunks)
+
+    @staticmethod
+    def _recompress(data):
+        """
+        Resize and recompress an image to fit IMAGE_MAX_DIMENSION and IMAGE_MAX_BYTES.
+
+        Returns:
+            tuple: (bytes, extension, width, height). The original bytes are kept when they
+            already fit the budget in a format slides can use.
+        """
+        with Image.open(io.BytesIO(data)) as image:
+            image.seek(0)
+            width, height = image.size
+            if width * height > BaseConfig.IMAGE_MAX_PIXELS:
+                raise ValueError(f"Image of {width}x{height} pixels exceeds IMAGE_MAX_PIXELS")
+            if (image.format in ("JPEG", "PNG") and len(data) <= BaseConfig.IMAGE_MAX_BYTES
+                    and max(width, height) <= BaseConfig.IMAGE_MAX_DIMENSION):
+                return data, image.format.lower().replace("jpeg", "jpg"), width, height
+
+            has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+            image = image.convert("RGBA" if has_alpha else "RGB")
+
+        image.thumbnail((BaseConfig.IMAGE_MAX_DIMENSION, BaseConfig.IMAGE_MAX_DIMENSION))
+        while True:
+            for quality in BaseConfig.IMAGE_QUALITY_STEPS:
+                output = io.BytesIO()
+                if has_alpha:
+                    image.save(output, format="PNG", optimize=True)
+                else:
+                    image.save(output, format="JPEG", quality=quality, optimize=True, progressive=True)
+                if output.tell() <= BaseConfig.IMAGE_MAX_BYTES or has_alpha:
+                    break
+            if output.tell() <= BaseConfig.IMAGE_MAX_BYTES or min(image.size) <= BaseConfig.IMAGE_MIN_DIMENSION:
+                break
+            # Still over budget, shrink and try again
+            image = image.resize((max(image.width * 3 // 4, 1), max(image.height * 3 // 4, 1)), Image.LANCZOS)
+
+        return output.getvalue(), "png" if has_alpha else "jpg", image.width, image.height
+
+    @staticmethod
+    def _store_image(data):
+        """Prepare and cache an image by content hash, reusing an existing copy of the same content."""
+        store = get_state_store()
+        content_hash = hashlib.sha256(data).hexdigest()
+        metadata = store.get(IMAGES_NAMESPACE, content_hash)
+        if metadata is not None:
+            return metadata
+
+        with span("image.recompress", request_bytes=len(data)) as current:
+            prepared, extension, width, height = ImageService._recompress(data)
+            current["response_bytes"] = len(prepared)
+
+        file_name = f"{content_hash}.{extension}"
+        os.makedirs(BaseConfig.IMAGE_CACHE_DIR, exist_ok=True)
+        path = os.path.join(BaseConfig.IMAGE_CACHE_DIR, file_name)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as image_file:
+            image_file.write(prepared)
+        os.replace(temp_path, path)
+
+        metadata = {
+            "hash": content_hash,
+            "file_name": file_name,
+            "width": width,
+            "height": height,
+            "original_bytes": len(data),
+            "bytes": len(prepared),
+        }
+        store.set(IMAGES_NAMESPACE, content_hash, metadata)
+        return metadata
+
+    @staticmethod
+    def _claim_url(url):
+        """
+        Claim a URL for fetching, or return its current state.
+
+        Returns:
+            dict: None if the caller must fetch the URL, otherwise its stored state.
+        """
+        state = {}
+
+        def claim(entry):
+            if entry is None:
+                return {"status": "fetching"}
+            state.update(entry)
+            return None
+
+        # The claim expires so a crashed worker cannot block a URL forever
+        get_state_store().update(
+            IMAGE_URLS_NAMESPACE, url, claim,
+            ttl=BaseConfig.IMAGE_CLAIM_TTL
+        )
+        return state or None
+
+    @staticmethod
+    def _prepare_url(url):
+        """
+        Return the prepared image for a URL, fetching it only if no worker has done so yet.
+
+        Returns:
+            tuple: (metadata or None, True if this call fetched the image)
+        """
+        store = get_state_store()
+        deadline = time.time() + BaseConfig.IMAGE_CLAIM_TTL
+        while True:
+            # Poll with plain reads and only take the write lock once the URL looks unclaimed
+            state = store.get(IMAGE_URLS_NAMESPACE, url)
+            if state is None:
+                state = ImageService._claim_url(url)
+                if state is None:
+                    break
+            if state["status"] == "ready":
+                return store.get(IMAGES_NAMESPACE, state["hash"]), False
+            if state["status"] == "failed" or time.time() > deadline:
+                return None, False
+            # Another thread or worker is fetching the URL
+            time.sleep(0.05)
+
+        try:
+            data = ImageService._fetch(url)
+            # Renew the claim so it cannot expire while the image is recompressed
+            store.set(IMAGE_URLS_NAMESPACE, url, {"status": "fetching"}, ttl=BaseConfig.IMAGE_CLAIM_TTL)
+            metadata = ImageService._store_image(data)
+        except Exception as e:
+            logger.warning(f"Failed to prepare image {url}: {e}")
+            store.set(
+                IMAGE_URLS_NAMESPACE, url,
+                {"status": "failed", "error": str(e)},
+                ttl=BaseConfig.IMAGE_FAILURE_TTL
+            )
+            return None, True
+
+        store.set(IMAGE_URLS_NAMESPACE, url, {"status": "ready", "hash": metadata["hash"]})
+        return metadata, True
+
+    @staticmethod
+    def prepare_images(markdown_data, page_url=None):
+        """
+        Fetch, de-duplicate, resize and cache the images referenced by scraped markdown.
+
+        Args:
+            markdown_data (str): The markdown returned by Firecrawl.
+            page_url (str, optional): The scraped page, used to resolve relative references.
+
+        Returns:
+            tuple: (dict of source URL -> prepared image dict, stats dict)
+        """
+        references = ImageService.extract_image_urls(markdown_data, page_url)
+        with span("image.prepare_images", images=len(references)) as current:
+            futures = [
+                _fetch_executor.submit(contextvars.copy_context().run, ImageService._prepare_url, url)
+                for url, _ in references
+            ]
+
+            images = {}
+            seen_hashes = set()
+            stats = {"referenced": len(references), "fetched": 0, "failed": 0, "bytes_saved": 0}
+            for (url, alt), future in zip(references, futures):
+                metadata, fetched = future.result()
+                stats["fetched"] += int(fetched)
+                if metadata is None:
+                    stats["failed"] += 1
+                    continue
+                images[url] = dict(metadata, source_url=url, alt=alt)
+                if metadata["hash"] not in seen_hashes:
+                    seen_hashes.add(metadata["hash"])
+                    stats["bytes_saved"] += metadata["original_bytes"] - metadata["bytes"]
+
+            current.update(stats)
+        return images, stats
+
+    @staticmethod
+    def start_preparing_images(markdown_data, page_url=None):
+        """Run `prepare_images` in the background. Returns a future."""
+        return _ingest_executor.submit(
+            contextvars.copy_context().run, ImageService.prepare_images, markdown_data, page_url
+        )
+
+    @staticmethod
+    def get_slide_images(slide_outline, images, page_url=None):
+        """
+        Build the `images_on_slide` entries of a slide from the images its outline references.
+
+        The outline's own `slide_image` entries are copied with their scraped URL swapped
+        for the prepared image served from IMAGE_PUBLIC_BASE_URL, since the backend cannot
+        download scraped URLs. Entries without a prepared image are dropped.
+
+        Args:
+            slide_outline (dict): The slide outline returned by the backend.
+            images (dict): Prepared images by source URL, from `prepare_images`.
+            page_url (str, optional): The scraped page, used to resolve relative references.
+
+        Returns:
+            list: The entries for `images_on_slide`.
+        """
+        slide_image = (slide_outline or {}).get("slide_image")
+        if isinstance(slide_image, dict):
+            slide_image = [slide_image]
+        if not isinstance(slide_image, list):
+            return []
+
+        public_base_url = BaseConfig.IMAGE_PUBLIC_BASE_URL.rstrip("/")
+        slide_images = []
+        for entry in slide_image:
+            if not isinstance(entry, dict):
+                continue
+            for field, value in entry.items():
+                if not isinstance(value, str):
+                    continue
+                image = images.get(urljoin(page_url, value) if page_url else value)
+                if image is None:
+                    continue
+                prepared = dict(entry)
+                prepared[field] = f"{public_base_url}/images/{image['hash']}"
+                for size_field in ("width", "height"):
+                    if size_field in prepared:
+                        prepared[size_field] = image[size_field]
+                slide_images.append(prepared)
+                break
+        return slide_images
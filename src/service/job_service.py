@@ -0,0 +1,170 @@
+import os
+import time
+import uuid
+import socket
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import g
+from ..clients.firecrawl_client import FirecrawlClient
+from ..config import BaseConfig
+from ..helpers.state_store import get_state_store
+from ..helpers.tracing import start_trace, end_trace
+from .presentation_service import PresentationService
+
+logger = logging.getLogger(__name__)
+
+# Job state lives in the shared state store so any worker can answer a poll
+JOBS_NAMESPACE = "jobs"
+
+_executor = ThreadPoolExecutor(max_workers=BaseConfig.JOB_WORKERS, thread_name_prefix="presentation-job")
+
+# Jobs owned by this process, kept alive by the heartbeat thread
+_active_jobs = set()
+_active_jobs_lock = threading.Lock()
+_heartbeat_pid = None
+
+
+def _heartbeat_loop():
+    """Refresh the heartbeat of every job this process owns."""
+    while True:
+        time.sleep(BaseConfig.JOB_HEARTBEAT_INTERVAL)
+        with _active_jobs_lock:
+            job_ids = list(_active_jobs)
+        for job_id in job_ids:
+            try:
+                JobService._update_job(job_id, heartbeat_at=time.time())
+            except Exception:
+                logger.exception(f"Failed to record heartbeat of presentation job {job_id}")
+
+
+def _ensure_heartbeat():
+    """Start the heartbeat thread of this process if it is not running yet."""
+    global _heartbeat_pid
+    with _active_jobs_lock:
+        if _heartbeat_pid == os.getpid():
+            return
+        _heartbeat_pid = os.getpid()
+    threading.Thread(target=_heartbeat_loop, name="presentation-job-heartbeat", daemon=True).start()
+
+
+class JobService:
+    """Service for running presentation creation in the background."""
+
+    @staticmethod
+    def _update_job(job_id, **fields):
+        """Update the stored state of a job."""
+        def update(job):
+            if job is None:
+                return None
+            job.update(fields)
+            job["updated_at"] = time.time()
+            return job
+
+        get_state_store().update(JOBS_NAMESPACE, job_id, update)
+
+    @staticmethod
+    def start_presentation_job(app, access_token, username, metadata):
+        """
+        Queue the creation of a presentation.
+
+        Args:
+            app: The Flask application, used to run the job in an app context.
+            access_token (str): The user's ALAI access token.
+            username (str): The user starting the job.
+            metadata (dict): The presentation request, as for `/presentation/create`.
+
+        Returns:
+            dict: The stored job.
+        """
+        _ensure_heartbeat()
+        job_id = uuid.uuid4().hex
+        job = {
+            "id": job_id,
+            "username": username,
+            "status": "pending",
+            "result": None,
+            "status_code": None,
+            "host": socket.gethostname(),
+            "pid": os.getpid(),
+            "created_at": time.time(),
+            "updated_at": time.time(),
+            "heartbeat_at": time.time(),
+        }
+        with _active_jobs_lock:
+            _active_jobs.add(job_id)
+        get_state_store().set(JOBS_NAMESPACE, job_id, job, ttl=BaseConfig.JOB_TTL)
+        _executor.submit(JobService._run_presentation_job, app, job_id, access_token, username, metadata)
+        return job
+
+    @staticmethod
+    def _run_presentation_job(app, job_id, access_token, username, metadata):
+        """Scrape the URL and create the presentation, recording the outcome on the job."""
+        result, status_code = {"error": "Failed to create presentation"}, 500
+        with app.app_context():
+            g.access_token = access_token
+            g.username = username
+            trace, token = start_trace(f"job {job_id}", username=username)
+            try:
+                JobService._update_job(job_id, status="running", trace_id=trace.trace_id)
+                markdown_data = FirecrawlClient().scrape_url(metadata["url"])
+                result, status_code = PresentationService.create_presentation_from_markdown(
+                    access_token,
+                    metadata,
+                    markdown_data,
+                    username
+                )
+            except Exception as e:
+                logger.exception(f"Presentation job {job_id} failed")
+                result, status_code = {"error": f"Failed to create presentation: {str(e)}"}, 500
+            finally:
+                end_trace(trace, token, status_code)
+                try:
+                    JobService._update_job(
+                        job_id,
+                        status="succeeded" if status_code == 200 else "failed",
+                        result=result,
+                        status_code=status_code
+                    )
+                except Exception:
+                    # Without heartbeats the job is reported failed once JOB_HEARTBEAT_TIMEOUT passes
+                    logger.exception(f"Failed to store the result of presentation job {job_id}")
+                with _active_jobs_lock:
+                    _active_jobs.discard(job_id)
+
+    @staticmethod
+    def _is_alive(job):
+        """Return False if the worker owning an unfinished job is gone or stopped sending heartbeats."""
+        if time.time() - job.get("heartbeat_at", job["updated_at"]) > BaseConfig.JOB_HEARTBEAT_TIMEOUT:
+            return False
+        if job.get("host") == socket.gethostname():
+            try:
+                os.kill(job["pid"], 0)
+            except ProcessLookupError:
+                return False
+            except PermissionError:
+                pass
+        return True
+
+    @staticmethod
+    def get_job(job_id, username):
+        """Return a job owned by the user, or None. Jobs whose worker is gone are reported failed."""
+        job = get_state_store().get(JOBS_NAMESPACE, job_id)
+        if job is None or job["username"] != username:
+            return None
+
+        if job["status"] in ("pending", "running") and not JobService._is_alive(job):
+            def mark_lost(current):
+                if current is None or current["status"] not in ("pending", "running"):
+                    return None
+                current.update(
+                    status="failed",
+                    result={"error": "Presentation job was lost, its worker stopped"},
+                    status_code=500,
+                    updated_at=time.time()
+                )
+                return current
+
+            get_state_store().update(JOBS_NAMESPACE, job_id, mark_lost)
+            job = get_state_store().get(JOBS_NAMESPACE, job_id)
+        return job
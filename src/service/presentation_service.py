@@ -1,7 +1,13 @@
+import time
 import uuid
 import logging
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from flask import g, jsonify
 from ..clients.alai_client import ALAIClient
+from ..config import BaseConfig
+from ..helpers.tracing import traced
+from ..functions import calibration as calibration_profiles
+from .image_service import ImageService
 
 logger = logging.getLogger(__name__)
 
@@ -25,9 +31,176 @@ class PresentationService:
             return "1"
     
     @staticmethod
-    def create_presentation_from_markdown(access_token, metadata, markdown_data):
+    def _calibrate(presentation_id, sample_text, tone, verbosity, tone_instructions):
+        """Run tone and verbosity calibration. Returns an error message or None."""
+        _, error = ALAIClient.calibrate_tone(
+            presentation_id,
+            sample_text,
+            tone,
+            tone_instructions
+        )
+        
+        if error:
+            return "Failed to calibrate tone"
+        
+        _, error = ALAIClient.calibrate_verbosity(
+            presentation_id,
+            sample_text,
+            verbosity,
+            tone,
+            tone_instructions
+        )
+        
+        if error:
+            return "Failed to calibrate verbosity"
+        
+        return None
+    
+    @staticmethod
+    def _resolve_calibration(username, metadata):
+        """
+        Work out the calibration settings of a request and the stored profile to reuse.
+        
+        A profile is looked up by the `calibration_profile` name in the metadata, or by the
+        requested tone/verbosity pair. Settings given alongside a named profile must match it.
+        
+        Returns:
+            tuple: (settings dict, None) or (None, error message)
+        """
+        tone = metadata.get("tone", BaseConfig.DEFAULT_TONE)
+        tone_instructions = metadata.get("tone_instructions", None)
+        try:
+            verbosity = int(metadata.get("verbosity", BaseConfig.DEFAULT_VERBOSITY))
+        except (TypeError, ValueError):
+            return None, "Verbosity must be an integer"
+        
+        name = metadata.get("calibration_profile") or calibration_profiles.get_profile_name(
+            tone, verbosity, tone_instructions
+        )
+        profile = calibration_profiles.get_profile(username, name) if username else None
+        
+        if profile and metadata.get("calibration_profile"):
+            requested = {"tone": tone, "verbosity": verbosity, "tone_instructions": tone_instructions}
+            conflicts = [
+                field for field, value in requested.items()
+                if field in metadata and value != profile[field]
+            ]
+            if conflicts:
+                return None, f"Calibration profile {name} conflicts with requested {', '.join(conflicts)}"
+            tone = profile["tone"]
+            verbosity = profile["verbosity"]
+            tone_instructions = profile["tone_instructions"]
+        
+        return {
+            "name": name,
+            "tone": tone,
+            "verbosity": verbosity,
+            "tone_instructions": tone_instructions,
+            "profile": profile,
+        }, None
+    
+    @staticmethod
+    def check_calibration(username, metadata):
+        """
+        Validate the calibration settings of a request before any upstream call is made.
+        
+        Returns:
+            str: An error message, or None if the settings are valid.
+        """
+        _, error = PresentationService._resolve_calibration(username, metadata)
+        return error
+    
+    @staticmethod
+    @traced("presentation.calibration")
+    def _apply_calibration(username, presentation_id, markdown_data, settings):
+        """
+        Calibrate a presentation, reusing the sample text of a stored calibration profile.
+        
+        Calibration is sent for every presentation, since the backend calibrates per
+        presentation; a stored profile only saves the sample text call. A fresh
+        calibration is stored as a profile for later decks.
+        
+        Returns:
+            tuple: ({"profile": name, "ms_saved": int}, None) or (None, error message)
+        """
+        name = settings["name"]
+        tone = settings["tone"]
+        verbosity = settings["verbosity"]
+        tone_instructions = settings["tone_instructions"]
+        profile = settings["profile"]
+        
+        if profile:
+            sample_text = profile["sample_text"]
+            ms_saved = profile.get("sample_text_ms", 0)
+        else:
+            # Get sample text for calibration
+            start = time.perf_counter()
+            sample_text, error = ALAIClient.get_sample_text(presentation_id, markdown_data)
+            sample_text_ms = int((time.perf_counter() - start) * 1000)
+            
+            if error or not sample_text:
+                return None, "Failed to get sample text for calibration"
+            ms_saved = 0
+        
+        error = PresentationService._calibrate(
+            presentation_id,
+            sample_text,
+            tone,
+            verbosity,
+            tone_instructions
+        )
+        
+        if error:
+            return None, error
+        
+        if profile:
+            calibration_profiles.record_profile_use(username, name, ms_saved)
+            logger.info(f"Applied calibration profile {name}, saved {ms_saved} ms")
+        elif username:
+            calibration_profiles.save_profile(
+                username,
+                name,
+                tone,
+                verbosity,
+                tone_instructions,
+                sample_text,
+                sample_text_ms
+            )
+        
+        return {"profile": name, "ms_saved": ms_saved}, None
+    
+    @staticmethod
+    def _get_prepared_images(images_future):
+        """Wait for the image ingestion stage and return the prepared images by source URL."""
+        if images_future is None:
+            return {}
+        try:
+            images, stats = images_future.result(timeout=BaseConfig.IMAGE_WAIT_TIMEOUT)
+        except FutureTimeoutError:
+            logger.warning(f"Scraped images not ready after {BaseConfig.IMAGE_WAIT_TIMEOUT} seconds, creating slides without them")
+            return {}
+        except Exception:
+            logger.exception("Error preparing scraped images")
+            return {}
+        logger.info(f"Prepared {len(images)} images, fetched {stats['fetched']}, saved {stats['bytes_saved']} bytes")
+        return images
+    
+    @staticmethod
+    @traced("presentation.create_from_markdown")
+    def create_presentation_from_markdown(access_token, metadata, markdown_data, username=None):
         """Create a presentation from markdown data."""
         try:
+            calibration_settings, error = PresentationService._resolve_calibration(username, metadata)
+            
+            if error:
+                return {"error": error}, 400
+            
+            # Prepare scraped images in the background, they can only be used once the
+            # backend can download them from IMAGE_PUBLIC_BASE_URL
+            images_future = None
+            if BaseConfig.IMAGE_PUBLIC_BASE_URL:
+                images_future = ImageService.start_preparing_images(markdown_data, metadata.get("url"))
+            
             # Create a new presentation
             presentation_id = uuid.uuid4().hex
             presentation_title = metadata.get("title", "Untitled Presentation")
@@ -68,34 +241,16 @@ class PresentationService:
                 slide_range
             )
             
-            # Get sample text for calibration
-            sample_text, error = ALAIClient.get_sample_text(presentation_id, markdown_data)
-            
-            if error or not sample_text:
-                return {"error": "Failed to get sample text for calibration"}, 500
-            
-            # Calibrate tone
-            _, error = ALAIClient.calibrate_tone(
-                presentation_id,
-                sample_text,
-                metadata.get("tone", "DEFAULT"),
-                metadata.get("tone_instructions", None)
-            )
-            
-            if error:
-                return {"error": "Failed to calibrate tone"}, 500
-            
-            # Calibrate verbosity
-            _, error = ALAIClient.calibrate_verbosity(
+            # Calibrate tone and verbosity, reusing the user's profile when available
+            calibration, error = PresentationService._apply_calibration(
+                username,
                 presentation_id,
-                sample_text,
-                metadata.get("verbosity", 3),
-                metadata.get("tone", "DEFAULT"),
-                metadata.get("tone_instructions", None)
+                markdown_data,
+                calibration_settings
             )
             
             if error:
-                return {"error": "Failed to calibrate verbosity"}, 500
+                return {"error": error}, 500
             
             # Create slides from outline
             messages = ALAIClient.create_slides_from_outline(
@@ -112,17 +267,24 @@ class PresentationService:
             if not slides:
                 return {"error": "No slides created in presentation"}, 500
             
-            # Create slide variants for each slide
+            prepared_images = PresentationService._get_prepared_images(images_future)
+            images_attached = 0
+            
+            # Create slide variants for each slide, with the prepared versions of the images its outline references
             for slide in slides:
                 slide_outline = slide.get("slide_outline", "")
-                # Here if we send the image data from slide_otuline["slide_image"] the socket returns 404 hence I have commented it out
+                slide_images = []
+                if prepared_images:
+                    slide_images = ImageService.get_slide_images(slide_outline, prepared_images, metadata.get("url"))
+                images_attached += len(slide_images)
                 ALAIClient.create_slide_variants(
                     access_token,
                     presentation_id,
                     slide_outline.get("slide_id", ""),
                     slide_outline.get("slide_title", ""),
                     slide_outline.get("slide_instructions", ""),
-                    metadata.get("instructions", "")
+                    metadata.get("instructions", ""),
+                    slide_images
                 )
             
             # Upsert presentation share
@@ -134,6 +296,9 @@ class PresentationService:
             return {
                 "message": "Presentation created successfully",
                 "url": f"https://app.getalai.com/view/{ppt_id}",
+                "calibration_profile": calibration["profile"],
+                "calibration_ms_saved": calibration["ms_saved"],
+                "images_attached": images_attached,
             }, 200
             
         except Exception as e:
@@ -0,0 +1,122 @@
+"""
+Multi-process worker mode.
+
+Starts N worker processes that serve the application from one shared listening
+socket and restarts workers that exit. Workers share tokens, scrape results,
+calibration profiles and job state through the SQLite state store, so a job
+started on one worker can be polled from another.
+
+Usage (from the repository root, POSIX only):
+    python -m src.supervisor --workers 4 --port 5500
+"""
+import time
+import signal
+import socket
+import logging
+import argparse
+import multiprocessing
+from werkzeug.serving import make_server
+from .config import BaseConfig
+
+logger = logging.getLogger(__name__)
+
+
+def _run_worker(app_factory, host, port, fd):
+    """Worker process entry point: build the app and serve from the shared socket."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # The supervisor handles Ctrl+C
+    app = app_factory()
+    server = make_server(host, port, app, threaded=True, fd=fd)
+    server.serve_forever()
+
+
+class Supervisor:
+    """Runs and supervises the worker processes."""
+
+    def __init__(self, app_factory, workers=None, host=None, port=None):
+        """
+        Initialize the supervisor.
+
+        Args:
+            app_factory (callable): Returns the WSGI application, called once in each worker.
+            workers (int, optional): Number of worker processes. Defaults to WORKER_COUNT.
+            host (str, optional): Host to listen on. Defaults to WORKER_HOST.
+            port (int, optional): Port to listen on, 0 picks a free port. Defaults to WORKER_PORT.
+        """
+        self.app_factory = app_factory
+        self.workers = workers or BaseConfig.WORKER_COUNT
+        self.host = host or BaseConfig.WORKER_HOST
+        self.port = BaseConfig.WORKER_PORT if port is None else port
+        self.socket = None
+        self.processes = []
+        self._context = multiprocessing.get_context("fork")
+        self._running = False
+
+    def _spawn(self):
+        process = self._context.Process(
+            target=_run_worker,
+            args=(self.app_factory, self.host, self.port, self.socket.fileno()),
+            daemon=True
+        )
+        process.start()
+        logger.info(f"Started worker {process.pid}")
+        return process
+
+    def start(self):
+        """Bind the shared socket and start the workers."""
+        # The supervisor never opens the state store, so workers do not inherit a
+        # SQLite connection across fork; each worker purges expired state itself
+        self.socket = socket.create_server((self.host, self.port), backlog=128)
+        self.socket.set_inheritable(True)
+        self.port = self.socket.getsockname()[1]
+
+        self.processes = [self._spawn() for _ in range(self.workers)]
+        self._running = True
+        logger.info(f"Serving on http://{self.host}:{self.port} with {self.workers} workers")
+
+    def stop(self):
+        """Stop the workers and close the shared socket."""
+        self._running = False
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            process.join(timeout=5)
+        self.processes = []
+        if self.socket is not None:
+            self.socket.close()
+            self.socket = None
+
+    def run(self):
+        """Start the workers and restart any that exit until interrupted."""
+        def handle_signal(signum, frame):
+            self._running = False
+
+        signal.signal(signal.SIGTERM, handle_signal)
+        signal.signal(signal.SIGINT, handle_signal)
+
+        self.start()
+        try:
+            while self._running:
+                for i, process in enumerate(self.processes):
+                    if not process.is_alive():
+                        logger.warning(f"Worker {process.pid} exited with {process.exitcode}, restarting")
+                        self.processes[i] = self._spawn()
+                time.sleep(0.5)
+        finally:
+            self.stop()
+
+
+def main():
+    from . import create_app
+
+    parser = argparse.ArgumentParser(description="Run the application in multi-process worker mode.")
+    parser.add_argument("--workers", type=int, default=BaseConfig.WORKER_COUNT)
+    parser.add_argument("--host", default=BaseConfig.WORKER_HOST)
+    parser.add_argument("--port", type=int, default=BaseConfig.WORKER_PORT)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    Supervisor(create_app, args.workers, args.host, args.port).run()
+
+
+if __name__ == "__main__":
+    main()